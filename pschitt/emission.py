@@ -2,6 +2,149 @@
 
 from . import geometry as geo
 import numpy as np
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit, prange
+
+try:
+    import distopia
+    # point versus array distances, available from distopia 0.3
+    _calc_distance_array_no_box = distopia.calc_distance_array_no_box
+except (ImportError, ValueError, AttributeError):
+    # ValueError is raised by distopia builds binary incompatible with the installed numpy,
+    # AttributeError by older versions without the kernel
+    distopia = None
+
+
+# Beyond break_angle + EXP_FALLOFF_CUTOFF/alpha the exponential falloff profile is below exp(-EXP_FALLOFF_CUTOFF)
+# and the particles are rejected without evaluating it
+EXP_FALLOFF_CUTOFF = 10.
+
+# Default random generator and per-thread scratch pools
+_RNG = np.random.default_rng()
+_THREAD_LOCAL = threading.local()
+
+
+class ScratchPool:
+    """
+    Pool of work buffers reused across calls to avoid allocating the same arrays for each event and telescope.
+    Buffers are identified by a name and a dtype. A buffer grows when a larger size is requested and
+    views on its first rows are returned, so the memory held is bounded by the largest request.
+    The content of a buffer is overwritten by the next call asking for it: a pool must not be shared between threads.
+    """
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, name, shape, dtype=np.float64):
+        """
+        Return a view of shape `shape` on the buffer `name`, allocating or growing the buffer if needed
+        Parameters
+        ----------
+        name: string
+        shape: int or tuple of ints - the buffer grows along the first dimension only
+        dtype: numpy dtype
+
+        Returns
+        -------
+        uninitialised C-contiguous numpy array
+        """
+        shape = shape if isinstance(shape, tuple) else (shape,)
+        key = (name, shape[1:], np.dtype(dtype))
+        buf = self._buffers.get(key)
+        if buf is None or len(buf) < shape[0]:
+            buf = self._buffers[key] = np.empty(shape, dtype=key[2])
+        return buf[:shape[0]]
+
+    def clear(self):
+        """
+        Release all the buffers
+        """
+        self._buffers.clear()
+
+
+def _thread_pool():
+    """
+    Default scratch pool of the calling thread
+    """
+    pool = getattr(_THREAD_LOCAL, 'pool', None)
+    if pool is None:
+        pool = _THREAD_LOCAL.pool = ScratchPool()
+    return pool
+
+
+def _random_draw(n, rng=None, pool=None):
+    """
+    Draw n uniform single precision random numbers in [0,1) in a buffer of the scratch pool.
+    The returned array is overwritten by the next call with the same pool.
+
+    Parameters
+    ----------
+    n: int
+    rng: `numpy.random.Generator` - default to the module generator
+    pool: `ScratchPool` - default to the pool of the calling thread
+
+    Returns
+    -------
+    numpy array of n float32
+    """
+    buf = (_thread_pool() if pool is None else pool).get('rand', n, np.float32)
+    (_RNG if rng is None else rng).random(dtype=np.float32, out=buf)
+    return buf
+
+
+def _vector_norms(vecs, out=None):
+    """
+    Compute the euclidean norms of an array of vectors
+    Parameters
+    ----------
+    vecs: Numpy array (N,3)
+    out: Numpy array (N) to write the norms in, optional
+
+    Returns
+    -------
+    numpy array of the N norms
+    """
+    norms = np.einsum('ij,ij->i', vecs, vecs, out=out)
+    return np.sqrt(norms, out=norms)
+
+
+def _distances_to_point(particles, point, backend='numpy', pool=None, name='distances'):
+    """
+    Compute the distances between particles and a fix point in space
+    Parameters
+    ----------
+    particles: Numpy array (N,3) of particles positions
+    point: 1D numpy array of three floats
+    backend: 'numpy' or 'distopia' (SIMD distance kernels, optional dependency).
+        The distopia backend is experimental and not covered by the test suite. It works in single precision:
+        pass float32 particles (see shower.particles_float32) to avoid a conversion at each call.
+    pool: `ScratchPool` - if given, the numpy backend works and returns in its buffers
+    name: string - name of the pool buffer holding the result
+
+    Returns
+    -------
+    numpy array of the N distances
+    """
+    if backend == 'distopia':
+        if distopia is None:
+            raise ImportError("The distopia backend requires distopia >= 0.3")
+        coords = np.ascontiguousarray(particles, dtype=np.float32)
+        return _calc_distance_array_no_box(coords, np.asarray(point, dtype=np.float32).reshape(1, 3)).ravel()
+    if backend != 'numpy':
+        raise ValueError("Unknown backend {0}, use 'numpy' or 'distopia'".format(backend))
+    if pool is None:
+        return _vector_norms(particles - point)
+    vecs = np.subtract(particles, point, out=pool.get('vecs', particles.shape))
+    return _vector_norms(vecs, out=pool.get(name, len(particles)))
+
+
+def _backend_particles(shower, backend):
+    """
+    Particles positions in the precision of the distance backend: the cached float32 copy for distopia
+    """
+    return shower.particles_float32 if backend == 'distopia' else shower.particles
 
 
 def transmission(distances):
@@ -10,13 +153,19 @@ def transmission(distances):
     1 corresponds to a complete transmission (no absorption)
     Parameters
     ----------
-    distances: numpy array of atmospheric length to go through
+    distances: float or numpy array of atmospheric length to go through
 
     Returns
     -------
-    numpy array of floats between 0 and 1 for all distances
+    float or numpy array of floats between 0 and 1 for all distances.
+    For now the transmission is total and the scalar 1.0 is returned, it broadcasts against the distances.
     """
-    return np.ones(len(distances))
+    return 1.0
+
+
+# Reference to the total transmission model: while `transmission` is this function,
+# the particles distances it ignores are not computed
+_total_transmission = transmission
 
 
 def emission_profile(dist):
@@ -80,7 +229,7 @@ def ground_profile_heaviside(dist, shift=120):
     -------
     float between 0 and 1
     """
-    return (dist<=shift) * 1. + (dist>shift) * 0.
+    return (np.asarray(dist) <= shift).astype(float)
 
 
 def ground_profile_1(dist, shift=120):
@@ -96,7 +245,12 @@ def ground_profile_1(dist, shift=120):
     -------
     float between 0 and 1
     """
-    return (dist<=shift) * 1. + (dist>shift) * 1./(dist - shift)
+    dist = np.asarray(dist)
+    profile = np.ones(dist.shape)
+    mask = dist > shift
+    np.subtract(dist, shift, out=profile, where=mask)
+    np.reciprocal(profile, out=profile, where=mask)
+    return profile
 
 
 def angular_profile_heaviside(angles, limit):
@@ -111,7 +265,23 @@ def angular_profile_heaviside(angles, limit):
     -------
     numpy array with same shape as angles giving the emission probabilities
     """
-    return 1 * (angles <= limit)
+    return (np.asarray(angles) <= limit).astype(float)
+
+
+def angular_profile_heaviside_cos(cos_angles, cos_limit):
+    """
+    angular_profile_heaviside expressed with the cosines of the angles, avoiding the arccos.
+    The emission profile is 1 below the limit angle (cosine above cos_limit) and 0 above.
+    Parameters
+    ----------
+    cos_angles: numpy array - cosines of the angles to the particle axis
+    cos_limit: float - cosine of the limit angle
+
+    Returns
+    -------
+    numpy array with same shape as cos_angles giving the emission probabilities
+    """
+    return (np.asarray(cos_angles) >= cos_limit).astype(float)
 
 
 def angular_profile_exp_falloff(angles, break_angle, alpha):
@@ -128,10 +298,235 @@ def angular_profile_exp_falloff(angles, break_angle, alpha):
     -------
     numpy array with same shape as angles
     """
-    return 1 * (angles < break_angle) + np.exp(-alpha*(angles - break_angle)) * (angles >= break_angle)
+    angles = np.asarray(angles)
+    profile = np.ones(angles.shape)
+    # undefined (NaN) angles go to the tail and give a NaN probability, never transmitted
+    mask = ~(angles < break_angle)
+    profile[mask] = np.exp(-alpha * (angles[mask] - break_angle))
+    return profile
+
+
+class _ExpFalloffProfile:
+    """
+    angular_profile_exp_falloff with break_angle and alpha bound, see make_exp_falloff
+    """
+    def __init__(self, break_angle, alpha):
+        self.break_angle = break_angle
+        self.alpha = alpha
+        self._neg_alpha = -alpha
+        self._offset = alpha * break_angle
+
+    def __call__(self, angles):
+        angles = np.asarray(angles)
+        profile = np.ones(angles.shape)
+        mask = ~(angles < self.break_angle)
+        tail = np.multiply(angles[mask], self._neg_alpha)
+        np.add(tail, self._offset, out=tail)
+        profile[mask] = np.exp(tail, out=tail)
+        return profile
+
+
+def make_exp_falloff(break_angle, alpha):
+    """
+    Return the exponential falloff profile (see angular_profile_exp_falloff) with break_angle and alpha
+    bound and the scalar constants precomputed.
+    The result can be given directly as angular_profile to mask_transmitted_particles, without extra arguments.
+
+    Parameters
+    ----------
+    break_angle: float
+    alpha: float
+
+    Returns
+    -------
+    picklable function of the angles only
+    """
+    return _ExpFalloffProfile(break_angle, alpha)
+
+
+def _exp_falloff_cos_cutoff(break_angle, alpha):
+    """
+    Cosine of the angle beyond which the exponential falloff profile is below exp(-EXP_FALLOFF_CUTOFF).
+    Profiles that do not decrease (alpha <= 0) have no cutoff.
+
+    Parameters
+    ----------
+    break_angle: float
+    alpha: float
+
+    Returns
+    -------
+    float, -1 when no particle can be rejected
+    """
+    if alpha <= 0:
+        return -1.
+    cutoff_angle = break_angle + EXP_FALLOFF_CUTOFF / alpha
+    return math.cos(cutoff_angle) if cutoff_angle < math.pi else -1.
+
+
+def _exp_falloff_params(angular_profile, args):
+    """
+    Parameters of an exponential falloff profile, given either as angular_profile_exp_falloff and its arguments
+    or by make_exp_falloff
+
+    Parameters
+    ----------
+    angular_profile: function
+    args: tuple, arguments of angular_profile
+
+    Returns
+    -------
+    (break_angle, alpha) or None for other profiles
+    """
+    if angular_profile is angular_profile_exp_falloff:
+        return args
+    if isinstance(angular_profile, _ExpFalloffProfile):
+        return angular_profile.break_angle, angular_profile.alpha
+    return None
+
+
+def _cone_profile(cos_angles, angular_profile, args):
+    """
+    Evaluate an angular profile from the cosines of the angles, with the shortcuts of the fused kernels:
+    the heaviside profile is evaluated in cosine space and the exponential falloff profile only
+    where it is above exp(-EXP_FALLOFF_CUTOFF). Undefined (NaN) cosines give a null or NaN profile.
+
+    Parameters
+    ----------
+    cos_angles: numpy array - cosines of the angles to the particle axis, in [-1, 1]
+    angular_profile: function to use for the angular_profile of the Cherenkov emission
+    args: tuple, arguments of angular_profile
+
+    Returns
+    -------
+    numpy array with same shape as cos_angles giving the emission probabilities
+    """
+    if angular_profile is angular_profile_heaviside:
+        return angular_profile_heaviside_cos(cos_angles, np.cos(np.clip(args[0], 0, np.pi)))
+    exp_falloff = _exp_falloff_params(angular_profile, args)
+    if exp_falloff is None:
+        return angular_profile(np.arccos(cos_angles), *args)
+    profile = np.zeros(cos_angles.shape)
+    kept = cos_angles >= _exp_falloff_cos_cutoff(*exp_falloff)
+    profile[kept] = angular_profile_exp_falloff(np.arccos(cos_angles[kept]), *exp_falloff)
+    return profile
+
+
+@njit(fastmath=True, cache=True)
+def _heaviside_transmitted(particles, i, mirror_center, direction, transmission, cos_limit, rand):
+    """
+    Transmission test of the particle i for angular_profile_heaviside, see _transmitted_heaviside
+    """
+    dx = particles[i, 0] - mirror_center[0]
+    dy = particles[i, 1] - mirror_center[1]
+    dz = particles[i, 2] - mirror_center[2]
+    dot = dx * direction[0] + dy * direction[1] + dz * direction[2]
+    norm = math.sqrt(dx * dx + dy * dy + dz * dz)
+    # a particle at the mirror center has no defined angle and is not transmitted
+    return norm > 0. and dot >= cos_limit * norm and transmission > rand
+
+
+@njit(fastmath=True, cache=True)
+def _exp_falloff_transmitted(particles, i, mirror_center, direction, transmission, break_angle, alpha, cos_cutoff,
+                             rand):
+    """
+    Transmission test of the particle i for angular_profile_exp_falloff, see _transmitted_exp_falloff
+    """
+    dx = particles[i, 0] - mirror_center[0]
+    dy = particles[i, 1] - mirror_center[1]
+    dz = particles[i, 2] - mirror_center[2]
+    norm = math.sqrt(dx * dx + dy * dy + dz * dz)
+    if norm == 0.:
+        # a particle at the mirror center has no defined angle and is not transmitted
+        return False
+    cos_angle = min(max((dx * direction[0] + dy * direction[1] + dz * direction[2]) / norm, -1.), 1.)
+    if cos_angle < cos_cutoff:
+        return False
+    angle = math.acos(cos_angle)
+    profile = 1. if angle < break_angle else math.exp(-alpha * (angle - break_angle))
+    return transmission * profile > rand
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _transmitted_heaviside(particles, mirror_center, direction, transmissions, cos_limit, rand):
+    """
+    Fused kernel of mask_transmitted_particles for angular_profile_heaviside.
+    The angle comparison is done in cosine space.
 
+    Parameters
+    ----------
+    particles: Numpy array (N,3) of particles positions - float32, promoted to float64 by mirror_center
+    mirror_center: Numpy array (3) - telescope mirror center
+    direction: Numpy array (3) - unit vector of the shower direction
+    transmissions: Numpy array (N) of air transmission coefficients
+    cos_limit: float - cosine of the limit angle
+    rand: Numpy array (N) of uniform random numbers in [0,1)
 
-def mask_transmitted_particles(tel, shower, angular_profile, *args):
+    Returns
+    -------
+    numpy array of booleans of length N
+    """
+    n = particles.shape[0]
+    mask = np.empty(n, np.bool_)
+    for i in prange(n):
+        mask[i] = _heaviside_transmitted(particles, i, mirror_center, direction, transmissions[i], cos_limit, rand[i])
+    return mask
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _transmitted_exp_falloff(particles, mirror_center, direction, transmissions, break_angle, alpha, cos_cutoff, rand):
+    """
+    Fused kernel of mask_transmitted_particles for angular_profile_exp_falloff.
+    Particles with a cosine below cos_cutoff are rejected before evaluating arccos and exp.
+
+    Parameters
+    ----------
+    particles: Numpy array (N,3) of particles positions - float32, promoted to float64 by mirror_center
+    mirror_center: Numpy array (3) - telescope mirror center
+    direction: Numpy array (3) - unit vector of the shower direction
+    transmissions: Numpy array (N) of air transmission coefficients
+    break_angle: float
+    alpha: float
+    cos_cutoff: float - cosine of the angle above which the profile is considered null
+    rand: Numpy array (N) of uniform random numbers in [0,1)
+
+    Returns
+    -------
+    numpy array of booleans of length N
+    """
+    n = particles.shape[0]
+    mask = np.empty(n, np.bool_)
+    for i in prange(n):
+        mask[i] = _exp_falloff_transmitted(particles, i, mirror_center, direction, transmissions[i],
+                                           break_angle, alpha, cos_cutoff, rand[i])
+    return mask
+
+
+# Single threaded versions of the kernels, for calls running outside of the main thread
+# (the workqueue threading layer of numba cannot be entered from several threads at once).
+# They are separate functions rather than recompilations of the parallel ones so that both can be cached.
+@njit(fastmath=True, cache=True)
+def _transmitted_heaviside_serial(particles, mirror_center, direction, transmissions, cos_limit, rand):
+    n = particles.shape[0]
+    mask = np.empty(n, np.bool_)
+    for i in range(n):
+        mask[i] = _heaviside_transmitted(particles, i, mirror_center, direction, transmissions[i], cos_limit, rand[i])
+    return mask
+
+
+@njit(fastmath=True, cache=True)
+def _transmitted_exp_falloff_serial(particles, mirror_center, direction, transmissions, break_angle, alpha,
+                                    cos_cutoff, rand):
+    n = particles.shape[0]
+    mask = np.empty(n, np.bool_)
+    for i in range(n):
+        mask[i] = _exp_falloff_transmitted(particles, i, mirror_center, direction, transmissions[i],
+                                           break_angle, alpha, cos_cutoff, rand[i])
+    return mask
+
+
+def mask_transmitted_particles(tel, shower, angular_profile, *args, rng=None, backend='numpy', pool=None,
+                               parallel=None):
     """
     Compute a masking array for the photons from the shower to know if they reach the telescope
     depending on their transmission probability.
@@ -143,23 +538,195 @@ def mask_transmitted_particles(tel, shower, angular_profile, *args):
     shower: shower class
     angular_profile: function to use for the angular_profile of the Cherenkov emission
     *args: arguements of the function angular_profile
+    rng: `numpy.random.Generator` used for the random draws, optional
+    backend: 'numpy' or 'distopia' - backend used for the particles distances to the camera center (transmission)
+        and for the angles of the generic profiles. The heaviside and exponential falloff profiles use fused
+        numba kernels computing their own norms, whatever the backend.
+        The distopia backend is experimental, see _distances_to_point.
+    pool: `ScratchPool` for the work buffers - default to the pool of the calling thread
+    parallel: Boolean - use the multi-threaded kernels. Default to True in the main thread only,
+        as the default numba threading layer aborts when its parallel kernels are run from several threads at once.
 
     Returns
     -------
     numpy array of booleans of length = len(shower.particles)
     """
-    # Compute the air transmission coefficient for each particle:
-    particle_distances = geo.distance_shower_camera_center(shower, tel)
-    transmissions = transmission(particle_distances)
+    pool = _thread_pool() if pool is None else pool
+    n = len(shower.particles)
+    if parallel is None:
+        parallel = threading.current_thread() is threading.main_thread()
 
-    # Compute the transmission profile relative to Cherenkov cone for each particle:
-    shower_direction = geo.altaz_to_normal(shower.alt, shower.az)
-    angles = np.array([geo.angle(shower_direction, particle - tel.mirror_center) for particle in shower.particles])
+    # Compute the air transmission coefficient for each particle:
+    if transmission is _total_transmission:
+        transmissions = 1.0
+    else:
+        particle_distances = _distances_to_point(_backend_particles(shower, backend), tel.camera_center,
+                                                 backend, pool)
+        transmissions = transmission(particle_distances)
+
+    rand = _random_draw(n, rng, pool)
+
+    # Compute the transmission profile relative to Cherenkov cone for each particle.
+    # Known profiles are evaluated in a single fused pass over the particles,
+    # comparing cosines first so that arccos and the profile are only evaluated when needed.
+    # The kernels read single precision positions, halving the memory traffic,
+    # while the angles are computed in double precision:
+    shower_direction = shower.direction
+    particles = shower.particles_float32
+
+    if angular_profile is angular_profile_heaviside:
+        kernel = _transmitted_heaviside if parallel else _transmitted_heaviside_serial
+        return kernel(particles, tel.mirror_center, shower_direction,
+                      np.broadcast_to(transmissions, n), np.cos(np.clip(args[0], 0, np.pi)), rand)
+
+    exp_falloff = _exp_falloff_params(angular_profile, args)
+    if exp_falloff is not None:
+        break_angle, alpha = exp_falloff
+        cos_cutoff = _exp_falloff_cos_cutoff(break_angle, alpha)
+        kernel = _transmitted_exp_falloff if parallel else _transmitted_exp_falloff_serial
+        return kernel(particles, tel.mirror_center, shower_direction,
+                      np.broadcast_to(transmissions, n), break_angle, alpha, cos_cutoff, rand)
+
+    vecs = np.subtract(shower.particles, tel.mirror_center, out=pool.get('vecs', shower.particles.shape))
+    if backend == 'numpy':
+        norms = _vector_norms(vecs, out=pool.get('norms', n))
+    else:
+        norms = _distances_to_point(_backend_particles(shower, backend), tel.mirror_center, backend)
+    angles = np.matmul(vecs, shower_direction, out=pool.get('angles', n))
+    np.divide(angles, norms, out=angles)
+    np.clip(angles, -1, 1, out=angles)
+    np.arccos(angles, out=angles)
 
     # The resulting transmission probability is the product of both:
-    p_trans = transmissions * angular_profile(angles, *args)
+    p_trans = np.multiply(transmissions, angular_profile(angles, *args), out=pool.get('p_trans', n))
 
-    mask_transmitted_particles = p_trans > np.random.rand(len(shower.particles))
+    mask_transmitted_particles = p_trans > rand
 
     return mask_transmitted_particles
 
+
+
+def mask_transmitted_particles_batch(tels, shower, angular_profile, *args, tile_size=16, rng=None):
+    """
+    Compute the masking arrays of mask_transmitted_particles for several telescopes at once.
+    The shower particles are broadcast against the telescopes positions, by tiles of
+    `tile_size` telescopes to limit the memory footprint.
+    The particles are sampled as in mask_transmitted_particles: for the same generator, the result equals
+    successive calls to mask_transmitted_particles for each telescope.
+
+    Parameters
+    ----------
+    tels: list of telescope classes or `geometry.TelescopeArray`
+    shower: shower class
+    angular_profile: function to use for the angular_profile of the Cherenkov emission
+    *args: arguements of the function angular_profile
+    tile_size: int - number of telescopes processed together
+    rng: `numpy.random.Generator` used for the random draws, optional
+
+    Returns
+    -------
+    numpy array of booleans of shape (len(tels), len(shower.particles))
+    """
+    particles = shower.particles_float32
+    mirror_centers = geo.mirror_centers(tels)
+    camera_centers = geo.camera_centers(tels)
+    shower_direction = shower.direction
+    rng = _RNG if rng is None else rng
+
+    masks = np.empty((len(tels), len(particles)), dtype=bool)
+    for start in range(0, len(tels), tile_size):
+        stop = start + tile_size
+
+        # Compute the air transmission coefficient for each particle:
+        if transmission is _total_transmission:
+            transmissions = 1.0
+        else:
+            dist_vecs = particles[None, :, :] - camera_centers[start:stop, None, :]
+            transmissions = transmission(np.sqrt(np.einsum('tni,tni->tn', dist_vecs, dist_vecs)))
+
+        # Compute the transmission profile relative to Cherenkov cone for each particle.
+        # Particles at a mirror center have an undefined (NaN) cosine and are not transmitted:
+        vecs = particles[None, :, :] - mirror_centers[start:stop, None, :]
+        norms = np.sqrt(np.einsum('tni,tni->tn', vecs, vecs))
+        with np.errstate(invalid='ignore'):
+            cos_angles = np.clip((vecs @ shower_direction) / norms, -1, 1)
+            p_trans = transmissions * _cone_profile(cos_angles, angular_profile, args)
+
+        masks[start:stop] = p_trans > rng.random(p_trans.shape, dtype=np.float32)
+
+    return masks
+
+
+# Thread pools of parallel_mask, kept alive across calls so that their threads keep their scratch pools
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _executor(n_jobs):
+    """
+    Return the long-lived thread pool executor with n_jobs workers.
+    n_jobs follows the joblib convention: negative values mean os.cpu_count() + 1 + n_jobs workers.
+
+    Parameters
+    ----------
+    n_jobs: int, not 0
+
+    Returns
+    -------
+    `concurrent.futures.ThreadPoolExecutor`
+    """
+    if not isinstance(n_jobs, (int, np.integer)) or n_jobs == 0:
+        raise ValueError("n_jobs must be a non-zero integer, got {0}".format(n_jobs))
+    n_workers = max(1, (os.cpu_count() or 1) + 1 + n_jobs) if n_jobs < 0 else int(n_jobs)
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(n_workers)
+        if executor is None:
+            executor = _EXECUTORS[n_workers] = ThreadPoolExecutor(max_workers=n_workers,
+                                                                  thread_name_prefix='pschitt-mask')
+    return executor
+
+
+def shutdown_parallel_mask(wait=True):
+    """
+    Stop the worker threads of parallel_mask, releasing their scratch pools.
+    The next call to parallel_mask starts new threads.
+
+    Parameters
+    ----------
+    wait: Boolean - wait for the running computations to end before returning
+    """
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+def parallel_mask(shower, tels, angular_profile, *args, n_jobs=-1, rng=None):
+    """
+    Compute mask_transmitted_particles for each telescope, the telescopes being processed in parallel threads.
+    Threads are enough as the computation runs in numpy and numba code releasing the GIL.
+    The worker threads are reused across calls, and so are their scratch pools,
+    until shutdown_parallel_mask is called.
+    Each telescope gets an independent random generator spawned from rng.
+
+    Parameters
+    ----------
+    shower: shower class
+    tels: list of telescope classes
+    angular_profile: function to use for the angular_profile of the Cherenkov emission
+    *args: arguements of the function angular_profile
+    n_jobs: int - number of threads. As in joblib, -1 uses all the CPUs, -2 all but one, etc.
+    rng: `numpy.random.Generator` used to spawn the telescopes generators, optional
+
+    Returns
+    -------
+    list of numpy arrays of booleans of length = len(shower.particles), one per telescope
+    """
+    executor = _executor(n_jobs)
+    rngs = (_RNG if rng is None else rng).spawn(len(tels))
+
+    def tel_mask(tel, tel_rng):
+        return mask_transmitted_particles(tel, shower, angular_profile, *args, rng=tel_rng, parallel=False)
+
+    return list(executor.map(tel_mask, tels, rngs))
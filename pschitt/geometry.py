@@ -38,7 +38,7 @@ class Telescope:
     def __init__(self, mirror_center, normal, camera_type='default'):
         Telescope.id += 1
         self.id = Telescope.id
-        self.mirror_center = np.array(mirror_center)
+        self.mirror_center = np.array(mirror_center, dtype=np.float64)
         self.normal = np.array(normal)/np.linalg.norm(normal)
         self.set_camera(camera_type)
         self.camera_center = self.mirror_center + self.normal * self.focal
@@ -153,6 +153,127 @@ class Telescope:
         self.normal = self.normal / np.sqrt((self.normal ** 2).sum())
 
 
+class TelescopeArray(list):
+    """
+    List of telescopes keeping the (T,3) arrays of their mirror and camera centers.
+    The arrays are built once and rebuilt only after the list has been modified.
+    Changing the position of a telescope already in the array is not detected:
+    call `reset_centers` after reassigning a `mirror_center` or `camera_center`.
+    """
+    def __init__(self, tels=()):
+        super().__init__(tels)
+        self._centers = None
+
+    def reset_centers(self):
+        """
+        Discard the cached centers arrays, they are rebuilt on next access
+        """
+        self._centers = None
+
+    def _build_centers(self):
+        if self._centers is None:
+            mirror_centers = np.array([tel.mirror_center for tel in self], dtype=np.float64).reshape(-1, 3)
+            camera_centers = np.array([tel.camera_center for tel in self], dtype=np.float64).reshape(-1, 3)
+            mirror_centers.flags.writeable = False
+            camera_centers.flags.writeable = False
+            self._centers = (mirror_centers, camera_centers)
+        return self._centers
+
+    @property
+    def mirror_centers(self):
+        """
+        Read-only numpy array (T,3) of the telescopes mirror centers
+        """
+        return self._build_centers()[0]
+
+    @property
+    def camera_centers(self):
+        """
+        Read-only numpy array (T,3) of the telescopes camera centers
+        """
+        return self._build_centers()[1]
+
+    def append(self, tel):
+        self.reset_centers()
+        super().append(tel)
+
+    def extend(self, tels):
+        self.reset_centers()
+        super().extend(tels)
+
+    def insert(self, index, tel):
+        self.reset_centers()
+        super().insert(index, tel)
+
+    def remove(self, tel):
+        self.reset_centers()
+        super().remove(tel)
+
+    def pop(self, index=-1):
+        self.reset_centers()
+        return super().pop(index)
+
+    def clear(self):
+        self.reset_centers()
+        super().clear()
+
+    def sort(self, **kwargs):
+        self.reset_centers()
+        super().sort(**kwargs)
+
+    def reverse(self):
+        self.reset_centers()
+        super().reverse()
+
+    def __setitem__(self, index, value):
+        self.reset_centers()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self.reset_centers()
+        super().__delitem__(index)
+
+    def __iadd__(self, tels):
+        self.reset_centers()
+        return super().__iadd__(tels)
+
+    def __imul__(self, n):
+        self.reset_centers()
+        return super().__imul__(n)
+
+
+def mirror_centers(alltel):
+    """
+    Array of the mirror centers of a list of telescopes
+    Parameters
+    ----------
+    alltel: list of telescope classes or TelescopeArray
+
+    Returns
+    -------
+    Numpy array (T,3)
+    """
+    if isinstance(alltel, TelescopeArray):
+        return alltel.mirror_centers
+    return np.array([tel.mirror_center for tel in alltel], dtype=np.float64).reshape(-1, 3)
+
+
+def camera_centers(alltel):
+    """
+    Array of the camera centers of a list of telescopes
+    Parameters
+    ----------
+    alltel: list of telescope classes or TelescopeArray
+
+    Returns
+    -------
+    Numpy array (T,3)
+    """
+    if isinstance(alltel, TelescopeArray):
+        return alltel.camera_centers
+    return np.array([tel.camera_center for tel in alltel], dtype=np.float64).reshape(-1, 3)
+
+
 def get_pixel_size(pixel_tab):
     """
     Compute the size of a pixel from the array of pixels positions assuming that all pixels have the same size
@@ -605,9 +726,9 @@ def load_telescopes(filename, normal = [0,0,1]):
 
     Returns
     -------
-    list of Telescope classes
+    TelescopeArray of Telescope classes
     """
-    tels = []
+    tels = TelescopeArray()
     with open(filename, 'r') as f:
         read_data = f.readlines()
     for line in read_data:
@@ -629,9 +750,9 @@ def load_telescopes_flatfloor(filename, normal = [0,0,1]):
 
     Returns
     -------
-    list of telescope classes
+    TelescopeArray of telescope classes
     """
-    tels = []
+    tels = TelescopeArray()
     with open(filename, 'r') as f:
         read_data = f.readlines()
     for line in read_data:
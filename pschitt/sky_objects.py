@@ -24,7 +24,76 @@ class shower:
         self.impact_point = [0,0,0]
         self.energy_primary = 0
         self.number_of_particles = 10
-        self.particles = np.empty((3,self.number_of_particles))
+        self.particles = np.empty((self.number_of_particles, 3))
+
+    @property
+    def alt(self):
+        """
+        Altitude angle of the shower direction
+        """
+        return self._alt
+
+    @alt.setter
+    def alt(self, alt):
+        self._alt = alt
+        self._direction = None
+
+    @property
+    def az(self):
+        """
+        Azimuth angle of the shower direction
+        """
+        return self._az
+
+    @az.setter
+    def az(self, az):
+        self._az = az
+        self._direction = None
+
+    @property
+    def direction(self):
+        """
+        Unit vector pointing in the shower direction (alt, az), computed once per direction change.
+        The cached vector is read-only, assign alt or az to change the direction.
+        """
+        if self._direction is None:
+            self._direction = geo.altaz_to_normal(self._alt, self._az)
+            self._direction.flags.writeable = False
+        return self._direction
+
+    @property
+    def particles(self):
+        """
+        Numpy array (N,3) - positions of particles in shower, stored as a read-only C-contiguous float64 copy.
+        Modify the particles by assigning a new array so that the cached float32 copy is kept in sync.
+        """
+        return self._particles
+
+    @particles.setter
+    def particles(self, parts):
+        parts = np.array(parts, dtype=np.float64, order='C')
+        if parts.ndim != 2 or parts.shape[1] != 3:
+            raise ValueError("The shower particles must be an array of shape (N,3), got {0}".format(parts.shape))
+        parts.flags.writeable = False
+        self._particles = parts
+        self._particles_float32 = None
+
+    @property
+    def particles_float32(self):
+        """
+        Single precision copy of the particles positions, computed once per particles assignment.
+        Used by the bandwidth bound passes over the particles (see emission.mask_transmitted_particles).
+        """
+        if self._particles_float32 is None:
+            self._particles_float32 = self._particles.astype(np.float32)
+        return self._particles_float32
+
+    @property
+    def particles_xyz(self):
+        """
+        Views on the x, y and z coordinates of the particles, without copy
+        """
+        return self._particles[:, 0], self._particles[:, 1], self._particles[:, 2]
 
     def linear_segment(self, shower_first_interaction, shower_bot):
         """
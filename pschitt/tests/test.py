@@ -1,9 +1,15 @@
-import geometry as geo
-import camera_image as ci
-import sky_objects as obj
-import hillas as hillas
+from pschitt import geometry as geo
+from pschitt import camera_image as ci
+from pschitt import sky_objects as obj
+from pschitt import hillas as hillas
+from pschitt import emission as em
 import numpy as np
 import unittest
+import threading
+from unittest import mock
+import matplotlib
+matplotlib.use('Agg')
+from pschitt import vizualisation as viz
 
 class TestGeometry(unittest.TestCase):
 
@@ -79,6 +85,282 @@ class TestGeometry(unittest.TestCase):
         assert geo.is_particle_visible(particle_position, particle_direction, particle_energy, telescope)
 
 
+    def test_telescope_array_centers(self):
+        """
+        Test that the cached centers of a TelescopeArray follow the modifications of the list
+        """
+        tels = geo.TelescopeArray([geo.Telescope([0, 0, 0], [0, 0, 1]), geo.Telescope([10, 0, 0], [0, 0, 1])])
+        assert (tels.mirror_centers == np.array([[0, 0, 0], [10, 0, 0]])).all()
+        assert not tels.mirror_centers.flags.writeable
+        tels.append(geo.Telescope([0, 20, 0], [0, 0, 1]))
+        assert tels.mirror_centers.shape == (3, 3)
+        del tels[0]
+        assert (tels.mirror_centers == np.array([[10, 0, 0], [0, 20, 0]])).all()
+        tels += [geo.Telescope([5, 5, 5], [0, 0, 1])]
+        assert (tels.camera_centers[-1] == tels[-1].camera_center).all()
+        tels[0].mirror_center = np.array([1., 1., 1.])
+        tels.reset_centers()
+        assert (tels.mirror_centers[0] == [1, 1, 1]).all()
+
+
+class TestEmission(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        self.shower = obj.shower()
+        self.shower.number_of_particles = 2000
+        self.shower.impact_point = [50, 20, 0]
+        self.shower.gaussian_ellipsoide(10000, 8000, 200)
+        self.tel = geo.Telescope([100, 50, 0], [0, 0, 1])
+        direction = geo.altaz_to_normal(self.shower.alt, self.shower.az)
+        self.angles = np.array([geo.angle(direction, p - self.tel.mirror_center) for p in self.shower.particles])
+
+
+    def reference_mask(self, angular_profile, *args, seed=1):
+        rand = np.random.default_rng(seed).random(len(self.angles), dtype=np.float32)
+        return angular_profile(self.angles, *args) > rand
+
+
+    def test_kernels_vs_profiles(self):
+        """
+        Test the fused kernels of mask_transmitted_particles against the numpy profiles
+        """
+        for angular_profile, args in [(em.angular_profile_heaviside, (0.02,)),
+                                      (em.angular_profile_exp_falloff, (0.018, 0.75)),
+                                      (em.angular_profile_exp_falloff, (0.01, 300.))]:
+            ref = self.reference_mask(angular_profile, *args)
+            for parallel in [True, False]:
+                mask = em.mask_transmitted_particles(self.tel, self.shower, angular_profile, *args,
+                                                     rng=np.random.default_rng(1), parallel=parallel)
+                assert (mask == ref).all()
+
+
+    def test_generic_profile(self):
+        """
+        Test the numpy path of mask_transmitted_particles, used for profiles without kernel
+        """
+        mask = em.mask_transmitted_particles(self.tel, self.shower, lambda a, l: em.angular_profile_heaviside(a, l),
+                                             0.02, rng=np.random.default_rng(1))
+        assert (mask == self.reference_mask(em.angular_profile_heaviside, 0.02)).all()
+
+
+    def test_heaviside_limit_out_of_range(self):
+        """
+        Test that heaviside limits outside [0, pi] keep their meaning in cosine space
+        """
+        assert not em.mask_transmitted_particles(self.tel, self.shower, em.angular_profile_heaviside, -1).any()
+        assert em.mask_transmitted_particles(self.tel, self.shower, em.angular_profile_heaviside, 4).all()
+
+
+    def test_angular_profile_exp_falloff(self):
+        """
+        Test the exponential falloff profile on both sides of the break angle
+        """
+        angles = np.array([0., 0.01, 0.018, 0.02, 0.1])
+        expected = np.where(angles < 0.018, 1., np.exp(-0.75 * (angles - 0.018)))
+        assert np.allclose(em.angular_profile_exp_falloff(angles, 0.018, 0.75), expected)
+        assert em.angular_profile_exp_falloff(0.1, 0.018, 0.75) == expected[-1]
+
+
+    def test_particles_shape(self):
+        """
+        Test that particles not given as an (N, 3) array are refused
+        """
+        with self.assertRaises(ValueError):
+            self.shower.particles = np.zeros((3, 10))
+
+
+    def test_heaviside_profiles(self):
+        """
+        Test the heaviside profiles on both sides of their limit
+        """
+        dist = np.array([0., 119., 120., 121., 500.])
+        assert (em.ground_profile_heaviside(dist) == [1, 1, 1, 0, 0]).all()
+        assert em.ground_profile_heaviside(dist).dtype == float
+        assert (em.angular_profile_heaviside(dist / 1000., 0.12) == [1, 1, 1, 0, 0]).all()
+        assert em.angular_profile_heaviside(0.2, 0.12) == 0
+
+
+    def test_direction_cache(self):
+        """
+        Test that the cached shower direction follows alt and az and cannot be modified in place
+        """
+        assert np.allclose(self.shower.direction, geo.altaz_to_normal(self.shower.alt, self.shower.az))
+        with self.assertRaises(ValueError):
+            self.shower.direction[0] = 1.
+        self.shower.alt = np.pi / 3.
+        assert np.allclose(self.shower.direction, geo.altaz_to_normal(np.pi / 3., self.shower.az))
+        self.shower.az = np.pi / 4.
+        assert np.allclose(self.shower.direction, geo.altaz_to_normal(np.pi / 3., np.pi / 4.))
+
+
+    def test_make_exp_falloff(self):
+        """
+        Test the pre-bound exponential falloff profile
+        """
+        angles = np.linspace(0, 0.2, 1000)
+        profile = em.make_exp_falloff(0.018, 0.75)
+        assert np.allclose(profile(angles), em.angular_profile_exp_falloff(angles, 0.018, 0.75))
+        mask = em.mask_transmitted_particles(self.tel, self.shower, profile, rng=np.random.default_rng(1))
+        assert (mask == self.reference_mask(em.angular_profile_exp_falloff, 0.018, 0.75)).all()
+
+
+    def test_particles_read_only(self):
+        """
+        Test that in-place modifications of the shower particles are refused
+        """
+        with self.assertRaises(ValueError):
+            self.shower.particles[:, 0] += 5000.
+        particles_float32 = self.shower.particles_float32
+        self.shower.particles = self.shower.particles + 1.
+        assert self.shower.particles_float32 is not particles_float32
+        assert np.allclose(self.shower.particles_float32, self.shower.particles)
+
+
+    def test_ground_profile_1(self):
+        """
+        Test ground_profile_1 around the shift, where the profile must stay finite
+        """
+        dist = np.array([0., 120., 121., 220.])
+        assert np.allclose(em.ground_profile_1(dist), [1., 1., 1., 0.01])
+        assert em.ground_profile_1(120.) == 1.
+
+
+    def test_scratch_pool(self):
+        """
+        Test that scratch pool buffers are reused and grow with the requested size
+        """
+        pool = em.ScratchPool()
+        buf = pool.get('a', (100, 3))
+        assert pool.get('a', (50, 3)).base is buf.base
+        assert pool.get('a', (200, 3)).shape == (200, 3)
+        pool.get('a', (10, 3))
+        assert len(pool._buffers) == 1
+
+
+    def test_transmission(self):
+        """
+        Test that transmission accepts scalar and array distances
+        """
+        assert em.transmission(3.0) == 1.
+        assert (np.ones(5) * em.transmission(np.arange(5.)) == 1.).all()
+
+
+    def test_exp_falloff_non_decreasing(self):
+        """
+        Test the exponential falloff kernel with alpha <= 0, where no particle can be cut off
+        """
+        for alpha in [0., -0.5]:
+            mask = em.mask_transmitted_particles(self.tel, self.shower, em.angular_profile_exp_falloff, 0.01, alpha,
+                                                 rng=np.random.default_rng(1))
+            assert (mask == self.reference_mask(em.angular_profile_exp_falloff, 0.01, alpha)).all()
+        assert mask.all()
+
+
+    def test_distance_dependent_transmission(self):
+        """
+        Test that a transmission model replacing the total transmission gets the particles distances
+        """
+        def opaque(distances):
+            assert np.allclose(distances, np.linalg.norm(self.shower.particles - self.tel.camera_center, axis=1))
+            return np.zeros(np.shape(distances))
+
+        with mock.patch.object(em, 'transmission', opaque):
+            assert not em.mask_transmitted_particles(self.tel, self.shower, em.angular_profile_heaviside, 4).any()
+            assert not em.mask_transmitted_particles_batch([self.tel], self.shower,
+                                                           em.angular_profile_heaviside, 4).any()
+
+
+    def test_kernels_from_threads(self):
+        """
+        Test mask_transmitted_particles called from other threads, where the serial kernels are used by default
+        """
+        ref = em.mask_transmitted_particles(self.tel, self.shower, em.angular_profile_exp_falloff, 0.018, 0.75,
+                                            rng=np.random.default_rng(1))
+        masks = []
+        threads = [threading.Thread(target=lambda: masks.append(
+            em.mask_transmitted_particles(self.tel, self.shower, em.angular_profile_exp_falloff, 0.018, 0.75,
+                                          rng=np.random.default_rng(1)))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(masks) == 4
+        assert all((mask == ref).all() for mask in masks)
+
+
+    def test_batch_vs_single(self):
+        """
+        Test mask_transmitted_particles_batch against one call per telescope drawing from the same generator
+        """
+        tels = [geo.Telescope([100 * i, 50 * (i % 3), 0], [0, 0, 1]) for i in range(20)]
+        for angular_profile, args in [(em.angular_profile_heaviside, (0.02,)),
+                                      (em.angular_profile_exp_falloff, (0.018, 0.75)),
+                                      (em.angular_profile_exp_falloff, (0.01, 300.)),
+                                      (em.make_exp_falloff(0.01, 300.), ())]:
+            batch = em.mask_transmitted_particles_batch(tels, self.shower, angular_profile, *args,
+                                                        tile_size=8, rng=np.random.default_rng(1))
+            rng = np.random.default_rng(1)
+            single = np.array([em.mask_transmitted_particles(tel, self.shower, angular_profile, *args, rng=rng)
+                               for tel in tels])
+            assert batch.shape == (20, len(self.shower.particles))
+            assert (batch == single).all()
+
+
+    @unittest.skipIf(em.distopia is None, "distopia >= 0.3 is not installed")
+    def test_distopia_backend(self):
+        """
+        Test the distopia distances against numpy
+        """
+        distopia_dist = em._distances_to_point(self.shower.particles_float32, self.tel.camera_center, 'distopia')
+        numpy_dist = em._distances_to_point(self.shower.particles, self.tel.camera_center, 'numpy')
+        assert np.allclose(distopia_dist, numpy_dist, rtol=1e-5)
+
+
+    def test_parallel_mask(self):
+        """
+        Test parallel_mask against sequential calls with the same spawned generators
+        """
+        tels = [geo.Telescope([100 * i, 0, 0], [0, 0, 1]) for i in range(6)]
+        masks = em.parallel_mask(self.shower, tels, em.angular_profile_exp_falloff, 0.01, 300.,
+                                 n_jobs=-2, rng=np.random.default_rng(3))
+        rngs = np.random.default_rng(3).spawn(len(tels))
+        for tel, tel_rng, mask in zip(tels, rngs, masks):
+            ref = em.mask_transmitted_particles(tel, self.shower, em.angular_profile_exp_falloff, 0.01, 300.,
+                                                rng=tel_rng)
+            assert (mask == ref).all()
+
+
+    def test_shutdown_parallel_mask(self):
+        """
+        Test that shutdown_parallel_mask stops the worker threads and that parallel_mask restarts them
+        """
+        tels = [geo.Telescope([100 * i, 0, 0], [0, 0, 1]) for i in range(3)]
+        masks = em.parallel_mask(self.shower, tels, em.angular_profile_heaviside, 0.02, n_jobs=2,
+                                 rng=np.random.default_rng(3))
+        em.shutdown_parallel_mask()
+        assert not em._EXECUTORS
+        assert not [thread for thread in threading.enumerate() if thread.name.startswith('pschitt-mask')]
+        masks_again = em.parallel_mask(self.shower, tels, em.angular_profile_heaviside, 0.02, n_jobs=2,
+                                       rng=np.random.default_rng(3))
+        assert all((mask == mask_again).all() for mask, mask_again in zip(masks, masks_again))
+        em.shutdown_parallel_mask()
+
+
+class TestVizualisation(unittest.TestCase):
+
+    def test_display_stacked_cameras(self):
+        """
+        Test that stacking cameras with different numbers of pixels is refused
+        """
+        tel1 = geo.Telescope([0, 0, 0], [0, 0, 1])
+        tel2 = geo.Telescope([10, 0, 0], [0, 0, 1])
+        tel1.signal_hist = np.ones(len(tel1.pixel_tab))
+        tel2.signal_hist = np.ones(len(tel1.pixel_tab) + 1)
+        viz.display_stacked_cameras([tel1, tel1])
+        with self.assertRaises(ValueError):
+            viz.display_stacked_cameras([tel1, tel2])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,7 +3,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import mpl_toolkits.mplot3d.art3d as art3d
-from scipy import stats
+from scipy import ndimage
+from . import geometry as geo
 
 
 def plot_shower3d(shower, alltel, **options):
@@ -15,6 +16,7 @@ def plot_shower3d(shower, alltel, **options):
     alltel: array of telescopes (telescope class)
     options:
         - density_color = True: use density for particles color. False by default.
+        - density_bins = 32: number of bins per axis of the histogram used to estimate the density.
         - display = True: show the plot. False by default
         - outfile = "file.eps" : save the plot as `file.eps`. False by default.
     """
@@ -33,11 +35,15 @@ def plot_shower3d(shower, alltel, **options):
     ax.add_patch(ip)
     art3d.pathpatch_2d_to_3d(ip, z=tel.mirror_center[2], zdir='z')
 
-    values = shower.particles.T
+    values = shower.particles_xyz
 
     if options.get("density_color") == True:
-        kde = stats.gaussian_kde(values)
-        density = kde(values)
+        # Density estimated on a smoothed 3D histogram rather than a gaussian kde, O(N) instead of O(N^2)
+        nbins = options.get("density_bins", 32)
+        hist, edges = np.histogramdd(shower.particles, bins=nbins)
+        hist = ndimage.gaussian_filter(hist, 1.0)
+        idx = tuple(np.clip(np.digitize(v, e) - 1, 0, nbins - 1) for v, e in zip(values, edges))
+        density = hist[idx]
         ax.scatter(values[0] , values[1], values[2], marker='o', c=density)
     else:
         ax.scatter(values[0] , values[1], values[2], marker='o')
@@ -76,11 +82,9 @@ def display_stacked_cameras(telescope_array):
     telescope_array: list of telescopes classes
     """
     tel0 = telescope_array[0]
-    l0 = len(tel0.signal_hist)
-    assert np.all([len(tel.signal_hist) == l0 for tel in telescope_array])
-    stacked_hist = np.zeros(l0)
-    for tel in telescope_array:
-        stacked_hist += tel.signal_hist
+    # np.stack raises if the cameras do not all have the same number of pixels
+    hists = np.stack([tel.signal_hist for tel in telescope_array])
+    stacked_hist = hists.sum(axis=0)
 
     plt.scatter(tel0.pixel_tab[:, 0], tel0.pixel_tab[:, 1], c=stacked_hist)
     plt.axis('equal')
@@ -111,14 +115,24 @@ def display_pointing_array(alltel):
     ----------
     alltel: list of telescope classes
     """
-    centers = np.array([tel.mirror_center for tel in alltel])
+    centers = geo.mirror_centers(alltel)
     xmin = centers[:,0].min() - 50
     xmax = centers[:,0].max() + 50
     ymin = centers[:,1].min() - 50
     ymax = centers[:,1].max() + 50
 
-    for tel in alltel:
-        display_pointing_tel(tel, show=False)
+    # Same drawing as display_pointing_tel in data units: a shaft of the length of the normal projection
+    # followed by a head of length 10 and width 5 (ax.arrow draws the head beyond the vector end)
+    head_length, head_width, width = 10., 5., 0.25
+    camera_centers = geo.camera_centers(alltel)
+    normals = np.array([tel.normal for tel in alltel])[:, :2]
+    lengths = np.hypot(normals[:, 0], normals[:, 1])
+    extension = np.divide(head_length, lengths, out=np.zeros_like(lengths), where=lengths > 0)
+    arrows = normals * (1 + extension)[:, np.newaxis]
+    plt.quiver(camera_centers[:, 0], camera_centers[:, 1], arrows[:, 0], arrows[:, 1],
+               angles='xy', scale_units='xy', scale=1, units='xy', width=width,
+               headwidth=head_width / width, headlength=head_length / width, headaxislength=head_length / width,
+               minlength=0, color='k')
 
     plt.axis('equal')
     plt.axis([xmin, xmax, ymin, ymax])
@@ -132,9 +146,10 @@ def plot_array(telescope_array):
     ----------
     telescope_array: list of telescopes classes
     """
-    for tel in telescope_array:
-        plt.scatter(tel.mirror_center[0], tel.mirror_center[1])
-        plt.annotate(str(tel.id), (tel.mirror_center[0] + 20, tel.mirror_center[1] + 20))
+    centers = geo.mirror_centers(telescope_array)
+    plt.scatter(centers[:, 0], centers[:, 1])
+    for tel, center in zip(telescope_array, centers):
+        plt.annotate(str(tel.id), (center[0] + 20, center[1] + 20))
     plt.axis('equal')
     plt.legend()
     plt.xlabel("x [m]")